@@ -6,12 +6,19 @@ when the battery level falls below a specified threshold.
 This script runs in the background and checks battery status at regular intervals.
 It sends a system notification when the battery is low and not charging.
 """
-from data_scrapping import log_battery_status
+from data_scrapping import BatteryLogger
 from pathlib import Path
+import logging.handlers
 import argparse
 import platform
 import logging
 import psutil
+import threading
+import atexit
+import queue
+import shutil
+import subprocess
+import signal
 import time
 import json
 import sys
@@ -30,6 +37,47 @@ DEFAULT_CONFIG = {
     "log_level": "INFO"
 }
 
+# Background listener writing queued records to the log file
+_log_listener = None
+
+# Parsed config keyed by (path, mtime_ns)
+_CONFIG_CACHE = {}
+
+# Operating system name, resolved once
+_SYSTEM = platform.system()
+
+# Linux sysfs power supply directory
+SYSFS_POWER_SUPPLY = Path("/sys/class/power_supply")
+
+def _probe_sysfs_paths():
+    """Resolve the sysfs battery capacity and AC online files once
+
+    Falls back to the battery's own status file when there is no AC
+    adapter entry (e.g. USB-C only laptops).
+
+    Returns:
+        tuple: (capacity_path, plugged_path) or None if they are not available
+    """
+    if _SYSTEM != "Linux":
+        return None
+    try:
+        capacity_paths = sorted(SYSFS_POWER_SUPPLY.glob("BAT*/capacity"))
+        online_paths = sorted(SYSFS_POWER_SUPPLY.glob("AC*/online")) or \
+            sorted(SYSFS_POWER_SUPPLY.glob("ADP*/online"))
+    except OSError:
+        return None
+    if not capacity_paths:
+        return None
+    if online_paths:
+        return capacity_paths[0], online_paths[0]
+
+    status_path = capacity_paths[0].with_name("status")
+    if not status_path.is_file():
+        return None
+    return capacity_paths[0], status_path
+
+_sysfs_paths = _probe_sysfs_paths()
+
 def setup_logging(log_level="INFO"):
     """Configure and set up logging"""
     # Create log directory if it doesn't exist
@@ -46,35 +94,68 @@ def setup_logging(log_level="INFO"):
     
     selected_level = log_level_map.get(log_level.upper(), logging.INFO)
     
-    logging.basicConfig(
-        level=selected_level,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(LOG_DIR / "battery_monitor.log"),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    global _log_listener
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+
+    # Drop handlers from a previous call so records aren't emitted twice
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+
+    # Write the log file from a listener thread so a slow disk never blocks
+    # the monitor loop
+    file_handler = logging.FileHandler(LOG_DIR / "battery_monitor.log")
+    file_handler.setFormatter(formatter)
+    log_queue = queue.Queue(-1)
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _log_listener.start()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    root.setLevel(selected_level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.addHandler(stream_handler)
     return logging.getLogger(__name__)
 
+def _stop_log_listener():
+    """Flush queued log records on exit"""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+atexit.register(_stop_log_listener)
+
 def load_config():
     """Load or create configuration file"""
-    if CONFIG_PATH.exists():
-        try:
-            with open(CONFIG_PATH, 'r') as f:
-                config = json.load(f)
-                # Merge with defaults for any missing keys
-                for key, value in DEFAULT_CONFIG.items():
-                    if key not in config:
-                        config[key] = value
-            return config
-        except json.JSONDecodeError:
-            logger.error(f"Invalid config file format. Using defaults.")
-            return DEFAULT_CONFIG
-    else:
+    try:
+        mtime_ns = CONFIG_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
         # Create default config file
         with open(CONFIG_PATH, 'w') as f:
             json.dump(DEFAULT_CONFIG, f, indent=4)
-        return DEFAULT_CONFIG
+        return dict(DEFAULT_CONFIG)
+
+    # Reuse the parsed config if the file hasn't changed
+    cache_key = (CONFIG_PATH, mtime_ns)
+    if cache_key in _CONFIG_CACHE:
+        return dict(_CONFIG_CACHE[cache_key])
+
+    try:
+        with open(CONFIG_PATH, 'r') as f:
+            # Merge with defaults for any missing keys
+            config = {**DEFAULT_CONFIG, **json.load(f)}
+    except json.JSONDecodeError:
+        logger.error("Invalid config file format. Using defaults.")
+        return dict(DEFAULT_CONFIG)
+
+    _CONFIG_CACHE.clear()
+    _CONFIG_CACHE[cache_key] = config
+    return dict(config)
 
 def get_battery_status():
     """Get current battery percentage and charging status
@@ -82,6 +163,18 @@ def get_battery_status():
     Returns:
         tuple: (battery_percent, is_plugged_in) or (None, None) if not available
     """
+    if _sysfs_paths is not None:
+        capacity_path, plugged_path = _sysfs_paths
+        try:
+            percent = int(capacity_path.read_text())
+            if plugged_path.name == "status":
+                plugged = plugged_path.read_text().strip() != "Discharging"
+            else:
+                plugged = plugged_path.read_text().strip() == "1"
+            return percent, plugged
+        except (OSError, ValueError) as e:
+            logger.debug("Reading sysfs battery files failed, falling back to psutil: %s", e)
+
     try:
         battery = psutil.sensors_battery()
         if battery is None:
@@ -92,9 +185,85 @@ def get_battery_status():
         
         return percent, plugged
     except Exception as e:
-        logger.error(f"Error getting battery status: {e}")
+        logger.error("Error getting battery status: %s", e)
         return None, None
 
+def _run_quiet(argv):
+    """Run a notification command directly, without a shell, discarding its output"""
+    subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+
+def _toast_notify():
+    """Build a Windows notifier, reusing a single ToastNotifier instance"""
+    try:
+        from win10toast import ToastNotifier
+    except ImportError:
+        def notify(title, message):
+            logger.warning("win10toast not installed. Using fallback notification method.")
+            # Fallback using PowerShell (Windows 10+); the text is passed through
+            # the environment so it is never parsed as part of the command
+            env = dict(os.environ, BATTERY_MONITOR_TITLE=title, BATTERY_MONITOR_MESSAGE=message)
+            subprocess.Popen(
+                ["powershell", "-NoProfile", "-Command",
+                 "New-BurntToastNotification -Text $env:BATTERY_MONITOR_TITLE, $env:BATTERY_MONITOR_MESSAGE"],
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        return notify
+
+    toaster = ToastNotifier()
+
+    def notify(title, message):
+        toaster.show_toast(title, message, duration=10, threaded=True)
+    return notify
+
+def _osascript_notify():
+    """Build a macOS notifier using osascript"""
+    def notify(title, message):
+        _run_quiet([
+            "osascript",
+            "-e", "on run argv",
+            "-e", "display notification (item 2 of argv) with title (item 1 of argv)",
+            "-e", "end run",
+            title, message
+        ])
+    return notify
+
+# First available Linux notification command, resolved once
+_NOTIFY_CMD = shutil.which("notify-send") or shutil.which("zenity") or shutil.which("kdialog")
+
+def _linux_notify():
+    """Build a Linux notifier using the first available notification command"""
+    if _NOTIFY_CMD is None:
+        def notify(title, message):
+            logger.warning("No notification command found (notify-send, zenity, kdialog)")
+        return notify
+
+    command = os.path.basename(_NOTIFY_CMD)
+    if command == "notify-send":
+        def notify(title, message):
+            _run_quiet([_NOTIFY_CMD, title, message])
+    elif command == "zenity":
+        def notify(title, message):
+            _run_quiet([_NOTIFY_CMD, "--notification", f"--text={title}: {message}"])
+    else:
+        def notify(title, message):
+            _run_quiet([_NOTIFY_CMD, "--passivepopup", message, "10", "--title", title])
+    return notify
+
+def _null_notify():
+    """Build a notifier for unsupported systems"""
+    def notify(title, message):
+        pass
+    return notify
+
+# Notifier factory per operating system ("Darwin" is macOS)
+_NOTIFIER_FACTORIES = {
+    "Windows": _toast_notify,
+    "Darwin": _osascript_notify,
+    "Linux": _linux_notify,
+}
+
+_notifier = _NOTIFIER_FACTORIES.get(_SYSTEM, _null_notify)()
+
 def send_notification(title, message):
     """Send a notification based on the operating system
     
@@ -102,42 +271,34 @@ def send_notification(title, message):
         title (str): The notification title
         message (str): The notification message content
     """
-    system = platform.system()
-    
     try:
-        if system == "Windows":
-            try:
-                from win10toast import ToastNotifier
-                toaster = ToastNotifier()
-                toaster.show_toast(title, message, duration=10, threaded=True)
-            except ImportError:
-                logger.warning("win10toast not installed. Using fallback notification method.")
-                # Fallback using PowerShell (Windows 10+)
-                ps_cmd = f'powershell -command "New-BurntToastNotification -Text \'{title}\', \'{message}\'"'
-                os.system(ps_cmd)
-        
-        elif system == "Darwin":  # macOS
-            os.system(f"""osascript -e 'display notification "{message}" with title "{title}"'""")
-        
-        elif system == "Linux":
-            # Try multiple notification methods
-            notification_methods = [
-                f"""notify-send "{title}" "{message}" """,
-                f"""zenity --notification --text="{title}: {message}" """,
-                f"""kdialog --passivepopup "{message}" 10 --title "{title}" """
-            ]
-            
-            for cmd in notification_methods:
-                try:
-                    exit_code = os.system(cmd + " >/dev/null 2>&1")
-                    if exit_code == 0:
-                        break
-                except:
-                    continue
-        
-        logger.info(f"Notification sent: {title} - {message}")
+        _notifier(title, message)
+        logger.info("Notification sent: %s - %s", title, message)
     except Exception as e:
-        logger.error(f"Failed to send notification: {e}")
+        logger.error("Failed to send notification: %s", e)
+
+def get_sleep_interval(percent, plugged, check_interval, threshold):
+    """Pick how long to wait before the next check based on battery state
+
+    Polls at the full rate only when the battery is close to the threshold,
+    and backs off while plugged in or well charged.
+
+    Args:
+        percent (int): Current battery percentage
+        plugged (bool): Whether the charger is connected
+        check_interval (int): Base check interval in seconds
+        threshold (int): Battery threshold percentage
+
+    Returns:
+        int: Seconds to wait before the next check
+    """
+    # Stay at full rate near the threshold even when plugged in, so pulling
+    # the charger at a low level is noticed within one interval
+    if percent <= threshold + 10:
+        return check_interval
+    if plugged or percent > 50:
+        return check_interval * 6
+    return check_interval * 2
 
 def parse_arguments():
     """Parse command line arguments
@@ -201,26 +362,36 @@ def main():
     CHECK_INTERVAL = config['check_interval']
     NOTIFICATION_REPEAT_DELAY = config['notification_repeat_delay']
     
-    logger.info(f"Battery monitor started (threshold: {BATTERY_THRESHOLD}%, interval: {CHECK_INTERVAL}s)")
+    logger.info("Battery monitor started (threshold: %s%%, interval: %ss)", BATTERY_THRESHOLD, CHECK_INTERVAL)
     
     send_notification("BigAddict", "A battery monitor has being started. Innovation at it's peek")
     
     # Keep track of alert state
     already_alerted = False
     last_alert_time = 0
+
+    # Notify once when logging starts failing and once when it recovers
+    battery_logger = BatteryLogger(
+        on_error=lambda e: send_notification("Data Scrapping", f"Scrapping failed\n{e}"),
+        on_recover=lambda: send_notification("Data Scrapping", "Scrapping recovered")
+    )
+
+    # Wake the loop immediately on SIGTERM instead of waiting out the interval
+    _stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *a: _stop.set())
     
     try:
-        while True:
+        while not _stop.is_set():
             percent, plugged = get_battery_status()
             
             if percent is None:
                 logger.warning("Could not get battery information")
-                time.sleep(CHECK_INTERVAL)
+                _stop.wait(CHECK_INTERVAL)
                 continue
                 
-            logger.debug(f"Battery level: {percent}% - Plugged in: {plugged}")
+            logger.debug("Battery level: %s%% - Plugged in: %s", percent, plugged)
             
-            current_time = time.time()
+            current_time = time.monotonic()
             time_since_last_alert = current_time - last_alert_time
             
             # Alert if battery is below threshold and not plugged in
@@ -239,19 +410,19 @@ def main():
                     logger.debug("Alert condition cleared")
                 already_alerted = False
 
-            try:
-                log_battery_status()
-            except Exception as e:
-                send_notification("Data Scrapping", f"Scrapping failed\n{e}")
-                continue
-                
-            # Wait before next check
-            time.sleep(CHECK_INTERVAL)
+            battery_logger.log_battery_status(percent, plugged)
+
+            # Wait before next check, polling less often when the battery is not low
+            sleep_for = get_sleep_interval(percent, plugged, CHECK_INTERVAL, BATTERY_THRESHOLD)
+            _stop.wait(sleep_for)
+
+        logger.info("Battery monitor stopped")
             
     except KeyboardInterrupt:
+        _stop.set()
         logger.info("Battery monitor stopped by user")
     except Exception as e:
-        logger.error(f"Error in main loop: {e}")
+        logger.error("Error in main loop: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -1,26 +1,109 @@
-from datetime import datetime
-import psutil
-import csv
+from pathlib import Path
+import atexit
+import struct
+import time
 import os
 
-# Path to save CSV
-CSV_FILE = "battery_log.csv"
+# Path to save the binary battery log, resolved once next to this module
+# rather than against whatever the working directory is when it is opened
+LOG_FILE = Path(__file__).resolve().parent / "battery_log.bin"
 
-def log_battery_status():
-    battery = psutil.sensors_battery()
-    percent = battery.percent
-    plugged = battery.power_plugged
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+# Fixed-size record: uint32 epoch seconds, int8 percent, int8 plugged flag
+RECORD = struct.Struct('<Ibb')
 
-    # Check if file already exists
-    file_exists = os.path.isfile(CSV_FILE)
+# Write an unchanged reading at least once every this many ticks
+HEARTBEAT_TICKS = 60
 
-    # Open the CSV file and append a new row
-    with open(CSV_FILE, mode='a', newline='') as file:
-        writer = csv.writer(file)
+# Upper bound in seconds on the retry backoff after write failures
+MAX_RETRY_DELAY = 3600
 
-        # If the file didn't exist, write headers first
-        if not file_exists:
-            writer.writerow(["timestamp", "percent", "plugged"])
+class BatteryLogger:
+    """Append battery readings to a binary log through a long-lived file handle
 
-        writer.writerow([timestamp, percent, plugged])
\ No newline at end of file
+    Write failures are retried with exponential backoff. on_error is called
+    with the exception when a failure episode starts and on_recover once
+    writing succeeds again.
+    """
+
+    def __init__(self, path=LOG_FILE, heartbeat_ticks=HEARTBEAT_TICKS,
+                 on_error=None, on_recover=None):
+        self._path = path
+        self._fh = None
+        self._heartbeat_ticks = heartbeat_ticks
+        self._last = None
+        self._ticks_since_write = 0
+        self._on_error = on_error
+        self._on_recover = on_recover
+        self._consecutive_fail = 0
+        self._next_retry_monotonic = 0
+
+        atexit.register(self.close)
+
+    def log_battery_status(self, percent, plugged, timestamp=None):
+        """Log a battery reading
+
+        Args:
+            percent (int): Battery percentage
+            plugged (bool): Whether the charger is connected
+            timestamp (float, optional): Epoch seconds of the reading; defaults to now
+        """
+        # Skip readings identical to the last row until the heartbeat is due;
+        # compare the values as stored so fractional percents don't count as changes
+        state = (int(percent), bool(plugged))
+        self._ticks_since_write += 1
+        if state == self._last and self._ticks_since_write < self._heartbeat_ticks:
+            return
+
+        # Back off after failures instead of retrying every tick
+        if self._consecutive_fail and time.monotonic() < self._next_retry_monotonic:
+            return
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        try:
+            if self._fh is None:
+                self._fh = self._open()
+            self._fh.write(RECORD.pack(int(timestamp), *state))
+
+            # Unchanged readings are skipped, so writes are rare; flush each one
+            # so the last rows before a power loss actually reach the disk
+            self._fh.flush()
+        except Exception as e:
+            # Drop the handle so the next attempt reopens the file
+            self._discard_handle()
+            self._consecutive_fail += 1
+            self._next_retry_monotonic = time.monotonic() + min(2 ** self._consecutive_fail, MAX_RETRY_DELAY)
+            if self._consecutive_fail == 1 and self._on_error is not None:
+                self._on_error(e)
+            return
+
+        self._last = state
+        self._ticks_since_write = 0
+
+        if self._consecutive_fail:
+            self._consecutive_fail = 0
+            if self._on_recover is not None:
+                self._on_recover()
+
+    def _open(self):
+        fh = open(self._path, mode='ab')
+        # Cut off a partial record left by a failed write or crash so later
+        # records stay aligned to RECORD.size
+        size = fh.seek(0, os.SEEK_END)
+        torn = size % RECORD.size
+        if torn:
+            fh.truncate(size - torn)
+        return fh
+
+    def _discard_handle(self):
+        fh, self._fh = self._fh, None
+        if fh is not None:
+            try:
+                fh.close()
+            except Exception:
+                pass
+
+    def close(self):
+        if self._fh is not None and not self._fh.closed:
+            self._fh.close()
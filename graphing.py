@@ -1,82 +1,183 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.widgets import Slider
-from matplotlib.animation import FuncAnimation
+from datetime import datetime
 import numpy as np
+import time
+import os
 
-# --- Load Data ---
-df = pd.read_csv('battery_log.csv', names=['timestamp', 'percent', 'plugged'], header=0)
-
-# --- Prepare Plot ---
-fig, ax = plt.subplots()
-plt.subplots_adjust(bottom=0.25)  # Space for the slider
-
-# Convert timestamp to datetime (for better x-axis labels)
-df['timestamp'] = pd.to_datetime(df['timestamp'])
-
-# Plot initial data
-line, = ax.plot(df['timestamp'], df['percent'], lw=2)
-ax.set_ylabel('Battery %')
-ax.set_xlabel('Timestamp')
-ax.set_title('Battery Percentage Over Time')
-ax.grid(True)
-
-# Set initial view limits
-window_size = 50  # Number of points visible at once
-start_idx = 0
-end_idx = min(window_size, len(df))
-
-ax.set_xlim(df['timestamp'][start_idx], df['timestamp'][end_idx - 1])
-
-# --- Add a Scroll Slider ---
-ax_slider = plt.axes([0.2, 0.1, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-slider = Slider(
-    ax=ax_slider,
-    label='Scroll',
-    valmin=0,
-    valmax=max(1, len(df) - window_size),
-    valinit=0,
-    valstep=1
-)
-
-# Update function for slider movement
-def update(val):
-    pos = int(slider.val)
-    ax.set_xlim(df['timestamp'][pos], df['timestamp'][pos + window_size - 1])
-    fig.canvas.draw_idle()
-
-slider.on_changed(update)
-
-# --- Live Data Simulation ---
-# This function simulates new data coming in and updates the plot
-def update_live(frame):
-    global df
-    # Simulate new data arriving by appending random values
-    new_data = {
-        'timestamp': pd.Timestamp.now(),
-        'percent': np.random.randint(0, 100),  # Random battery percent
-        'plugged': np.random.choice([True, False])  # Random plugged status
-    }
-    
-    # Convert new data to DataFrame and concatenate it with the existing DataFrame
-    new_df = pd.DataFrame([new_data])
-    df = pd.concat([df, new_df], ignore_index=True)
-    
-    # Update the plot with the new data
-    line.set_data(df['timestamp'], df['percent'])
-    
-    # Update the slider max value to allow for the extended dataset
-    slider.valmax = len(df) - window_size
-    slider.valinit = max(0, slider.val)
-
-    # Re-set the x-axis limits based on the slider position
-    pos = int(slider.val)
-    ax.set_xlim(df['timestamp'][pos], df['timestamp'][pos + window_size - 1])
-
-    return line,  # Return updated plot elements
-
-# Create the animation
-ani = FuncAnimation(fig, update_live, interval=1000)  # Update every 1 second
-
-# Show the plot
-plt.show()
\ No newline at end of file
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BIN_LOG_PATH = os.path.join(BASE_DIR, 'battery_log.bin')
+CSV_LOG_PATH = os.path.join(BASE_DIR, 'battery_log.csv')
+
+# Older versions wrote the CSV log to the working directory (e.g. $HOME for
+# the autostart launchers), so look there too
+LEGACY_CSV_LOG_PATH = 'battery_log.csv'
+
+LOG_DTYPE = np.dtype([('ts', '<u4'), ('p', 'i1'), ('c', 'i1')])
+
+# Number of points visible at once
+WINDOW_SIZE = 50
+
+def epoch_to_local(epoch):
+    """Convert epoch seconds to naive local-time datetime64[ns] values
+
+    The UTC offset is looked up once per hour of data so DST changes
+    inside the log are honoured without a Python call per row.
+    """
+    epoch = epoch.astype(np.int64)
+    hours, inverse = np.unique(epoch // 3600, return_inverse=True)
+    offsets = np.array([time.localtime(int(h) * 3600).tm_gmtoff for h in hours], dtype=np.int64)
+    return (epoch + offsets[inverse]).astype('datetime64[s]').astype('datetime64[ns]')
+
+def _load_bin_log(bin_path):
+    with open(bin_path, 'rb') as f:
+        buf = f.read()
+    # Ignore a torn trailing record left by a crash or full disk
+    buf = buf[:len(buf) - len(buf) % LOG_DTYPE.itemsize]
+    records = np.frombuffer(buf, dtype=LOG_DTYPE)
+    return epoch_to_local(records['ts']), records['p'].copy()
+
+def _load_csv_log(csv_path):
+    import pandas as pd
+    read_csv_kwargs = dict(
+        names=['timestamp', 'percent', 'plugged'],
+        header=0,
+        # psutil reports a float percent on Linux, so older rows aren't integers
+        dtype={'percent': 'float64', 'plugged': 'bool'},
+    )
+    try:
+        df = pd.read_csv(csv_path, engine='pyarrow', **read_csv_kwargs)
+    except ImportError:
+        # pyarrow is optional; fall back to the default C parser
+        df = pd.read_csv(csv_path, **read_csv_kwargs)
+
+    # Convert timestamp to datetime (for better x-axis labels)
+    timestamps = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]')
+    # Truncate like the binary writer's int(percent) so both sources agree
+    percents = np.clip(df['percent'].to_numpy(), 0, 100).astype(np.int8)
+    return timestamps, percents
+
+def load_battery_log(bin_path=BIN_LOG_PATH, csv_path=CSV_LOG_PATH):
+    """Load the battery log into timestamp and percent arrays
+
+    History from an older CSV log comes first, followed by the binary
+    records written since the upgrade.
+
+    Returns:
+        tuple: (timestamps as datetime64[ns], percents as int8)
+    """
+    parts = []
+
+    # Older logs were written as CSV
+    if not os.path.isfile(csv_path) and os.path.isfile(LEGACY_CSV_LOG_PATH):
+        csv_path = LEGACY_CSV_LOG_PATH
+    if os.path.isfile(csv_path):
+        parts.append(_load_csv_log(csv_path))
+
+    if os.path.isfile(bin_path):
+        parts.append(_load_bin_log(bin_path))
+
+    if not parts:
+        return np.empty(0, dtype='datetime64[ns]'), np.empty(0, dtype=np.int8)
+    timestamps = np.concatenate([part[0] for part in parts])
+    percents = np.concatenate([part[1] for part in parts])
+    return timestamps, percents
+
+def main():
+    import matplotlib.pyplot as plt
+    from matplotlib.widgets import Slider
+    from matplotlib.animation import FuncAnimation
+
+    # --- Load Data ---
+    timestamps, percents = load_battery_log()
+
+    # Copy the columns into preallocated arrays so live updates append in place
+    # instead of rebuilding the data on every tick
+    head = len(timestamps)
+    capacity = max(4096, 2 * head)
+    ts = np.empty(capacity, dtype='datetime64[ns]')
+    pct = np.empty(capacity, dtype=np.int8)
+    ts[:head] = timestamps
+    pct[:head] = percents
+    del timestamps, percents
+
+    # --- Prepare Plot ---
+    fig, ax = plt.subplots()
+    plt.subplots_adjust(bottom=0.25)  # Space for the slider
+
+    # Set initial view limits
+    start_idx = 0
+    end_idx = min(WINDOW_SIZE, head)
+
+    # Plot only the visible window; scrolling swaps the line data instead of
+    # drawing the whole history outside the axis limits
+    line, = ax.plot(ts[start_idx:end_idx], pct[start_idx:end_idx], lw=2)
+    ax.set_ylabel('Battery %')
+    ax.set_xlabel('Timestamp')
+    ax.set_title('Battery Percentage Over Time')
+    ax.set_ylim(0, 100)
+    ax.grid(True)
+
+    if head:
+        ax.set_xlim(ts[start_idx], ts[end_idx - 1])
+
+    # --- Add a Scroll Slider ---
+    ax_slider = plt.axes([0.2, 0.1, 0.65, 0.03], facecolor='lightgoldenrodyellow')
+    slider = Slider(
+        ax=ax_slider,
+        label='Scroll',
+        valmin=0,
+        valmax=max(1, head - WINDOW_SIZE),
+        valinit=0,
+        valstep=1
+    )
+
+    # Update function for slider movement
+    def set_window(pos):
+        """Show the window starting at pos and return its (start, end) indices"""
+        if not head:
+            return 0, 0
+        start = max(0, min(pos, head - 1))
+        end = min(start + WINDOW_SIZE, head)
+        line.set_data(ts[start:end], pct[start:end])
+        ax.set_xlim(ts[start], ts[end - 1])
+        return start, end
+
+    def update(val):
+        nonlocal start_idx, end_idx
+        start_idx, end_idx = set_window(int(slider.val))
+        fig.canvas.draw_idle()
+
+    slider.on_changed(update)
+
+    # --- Live Data Simulation ---
+    # This function simulates new data coming in and updates the plot
+    def update_live(frame):
+        nonlocal ts, pct, head, end_idx
+        # Grow the buffers by doubling when full so appends stay amortized O(1)
+        if head == len(ts):
+            ts = np.resize(ts, 2 * len(ts))
+            pct = np.resize(pct, 2 * len(pct))
+
+        # Simulate new data arriving by appending random values
+        ts[head] = np.datetime64(datetime.now(), 'ns')
+        pct[head] = np.random.randint(0, 100)  # Random battery percent
+        head += 1
+
+        # Update the slider max value to allow for the extended dataset
+        slider.valmax = max(1, head - WINDOW_SIZE)
+        slider.valinit = max(0, slider.val)
+
+        # Only a window that is still filling up changes; the animation
+        # redraws the figure, so just move the data and x limits with it
+        if min(start_idx + WINDOW_SIZE, head) != end_idx:
+            _, end_idx = set_window(start_idx)
+
+        return line,  # Return updated plot elements
+
+    # Create the animation
+    ani = FuncAnimation(fig, update_live, interval=1000)  # Update every 1 second
+
+    # Show the plot
+    plt.show()
+
+if __name__ == "__main__":
+    main()